@@ -441,6 +441,23 @@ def team_api_test_data(set_team_base_test_data):
     return _f
 
 
+@pytest.fixture
+def populate_course_teams():
+    def _f(course_id, topic_id, team_count, member_count):
+        """
+        Create `team_count` teams in the teamset, each with `member_count` new members
+        """
+        course_teams = []
+        for _ in range(team_count):
+            course_team = CourseTeamFactory.create(course_id=course_id, topic_id=topic_id)
+            for _ in range(member_count):
+                CourseTeamMembershipFactory.create(team=course_team, user=UserFactory.create())
+            course_teams.append(course_team)
+        return course_teams
+
+    return _f
+
+
 @pytest.fixture
 def team_emoji_api_test_data(
     set_team_base_test_data,
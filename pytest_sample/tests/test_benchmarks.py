@@ -0,0 +1,271 @@
+"""
+Latency, query count and memory benchmarks for the plugin API endpoints.
+
+Skipped unless PLUGIN_API_BENCHMARK is set, e.g.
+
+    PLUGIN_API_BENCHMARK=1 pytest pytest_sample/tests/test_benchmarks.py
+
+Settings (environment variables):
+
+    PLUGIN_API_BENCHMARK_SIZES       teams x members per team, default "10x10,100x10,1000x10,10x100,100x100,1000x100"
+    PLUGIN_API_BENCHMARK_ITERATIONS  timed calls per scenario, at least 2, default 100
+    PLUGIN_API_BENCHMARK_OUTPUT      where results are written, default "benchmark_results.json"
+    PLUGIN_API_BENCHMARK_BASELINE    previous results to compare against, optional
+    PLUGIN_API_BENCHMARK_TOLERANCE   allowed p50 slowdown against the baseline, default 0.5 (50%)
+
+Every size gets its own teamset, built once. get_team_details is sized by member count only,
+and list_teams_user_joined joins the user to one team per teamset, as CourseTeam.add_user allows.
+"""
+import json
+import os
+import shutil
+import statistics
+import time
+import tracemalloc
+
+import pytest
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from unittest import mock
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+
+from common.djangoapps.util.testing import patch_sessions, patch_testcase
+
+from openedx.core.lib.teams_config import TeamsConfig
+from plugin_api.teams.serializers import TeamDiscussionFileUploadSerializer
+from .conftest import (
+    CourseTeamMembershipFactory,
+    AUTH_KEYCLOAK,
+    TEAM_MIXIN,
+)
+
+
+# required to bypass auth middleware
+patch_testcase()
+patch_sessions()
+
+DIR_PATH = os.path.dirname(os.path.realpath(__file__))
+
+BENCHMARK_ENABLED = bool(os.environ.get("PLUGIN_API_BENCHMARK"))
+BENCHMARK_SIZES = list(dict.fromkeys(
+    tuple(int(value) for value in size.split("x"))
+    for size in os.environ.get(
+        "PLUGIN_API_BENCHMARK_SIZES", "10x10,100x10,1000x10,10x100,100x100,1000x100"
+    ).split(",")
+))
+BENCHMARK_ITERATIONS = int(os.environ.get("PLUGIN_API_BENCHMARK_ITERATIONS", 100))
+BENCHMARK_OUTPUT = os.environ.get("PLUGIN_API_BENCHMARK_OUTPUT", "benchmark_results.json")
+BENCHMARK_BASELINE = os.environ.get("PLUGIN_API_BENCHMARK_BASELINE")
+BENCHMARK_TOLERANCE = float(os.environ.get("PLUGIN_API_BENCHMARK_TOLERANCE", 0.5))
+
+if BENCHMARK_ENABLED and BENCHMARK_ITERATIONS < 2:
+    raise ValueError("PLUGIN_API_BENCHMARK_ITERATIONS must be at least 2 to compute p99")
+
+pytestmark = pytest.mark.skipif(
+    not BENCHMARK_ENABLED, reason="set PLUGIN_API_BENCHMARK to run benchmarks"
+)
+
+
+def get_benchmark_topic_id(team_count, member_count):
+    return f"benchmark-{team_count}x{member_count}"
+
+
+@pytest.fixture
+def teams_config_fx(topic_id_fx) -> TeamsConfig:
+    max_team_size = max(member_count for _, member_count in BENCHMARK_SIZES) + 1
+    return TeamsConfig(
+        {
+            "topics": [
+                {
+                    "name": topic_id,
+                    "description": f"Description for {topic_id}",
+                    "id": topic_id,
+                    "max_team_size": max_team_size,
+                }
+                for topic_id in [topic_id_fx] + [
+                    get_benchmark_topic_id(*size) for size in BENCHMARK_SIZES
+                ]
+            ]
+        }
+    )
+
+
+@pytest.fixture(scope="module")
+def benchmark_results():
+    results = {}
+    yield results
+
+    with open(BENCHMARK_OUTPUT, "w") as output:
+        json.dump(results, output, indent=2, sort_keys=True)
+
+
+@pytest.fixture(scope="module")
+def benchmark_baseline():
+    if not BENCHMARK_BASELINE:
+        return {}
+    with open(BENCHMARK_BASELINE) as baseline:
+        return json.load(baseline)
+
+
+def measure(call):
+    """
+    Call `call` BENCHMARK_ITERATIONS times and return latency, query count and peak memory
+    """
+    # warm up caches and last_visited_teams_at before timing
+    call()
+
+    latencies = []
+    for _ in range(BENCHMARK_ITERATIONS):
+        start = time.perf_counter()
+        call()
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    # query logging and memory tracing slow the call down, so they get calls of their own
+    with CaptureQueriesContext(connection) as queries:
+        call()
+
+    tracemalloc.start()
+    call()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": statistics.quantiles(latencies, n=100)[98],
+        "queries": len(queries),
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+class BenchmarkTestCase(SharedModuleStoreTestCase):
+    @pytest.fixture(autouse=True)
+    def _conftest(
+        self, team_api_test_data, populate_course_teams, benchmark_results, benchmark_baseline
+    ):
+        team_api_test_data(self)
+        self.populate_course_teams = populate_course_teams
+        self.benchmark_results = benchmark_results
+        self.benchmark_baseline = benchmark_baseline
+
+    def _record(self, name, call):
+        self.benchmark_results[name] = measure(call)
+        return name
+
+    def _assert_no_regressions(self, names):
+        """
+        Compare the recorded scenarios against the baseline, reporting every regression at once
+        """
+        regressions = []
+        for name in names:
+            result = self.benchmark_results[name]
+            baseline = self.benchmark_baseline.get(name)
+            if not baseline:
+                continue
+            if result["queries"] > baseline["queries"]:
+                regressions.append(
+                    f"{name}: {result['queries']} queries, baseline {baseline['queries']}"
+                )
+            if result["p50_ms"] > baseline["p50_ms"] * (1 + BENCHMARK_TOLERANCE):
+                regressions.append(
+                    f"{name}: p50 {result['p50_ms']:.2f} ms, baseline {baseline['p50_ms']:.2f} ms"
+                )
+        assert not regressions, "\n".join(regressions)
+
+    def _record_view(self, name, url, context):
+        def call():
+            response = self.client.get(url)
+            assert response.status_code == 200
+
+        with mock.patch(AUTH_KEYCLOAK, return_value=(self.user, None)), mock.patch(
+            TEAM_MIXIN, return_value=context
+        ):
+            return self._record(name, call)
+
+
+class TestTeamViewsBenchmark(BenchmarkTestCase):
+    @pytest.mark.django_db
+    def test_team_views(self):
+        joined_teams = [self.course_team]
+        detail_member_counts = set()
+        names = []
+
+        for team_count, member_count in BENCHMARK_SIZES:
+            topic_id = get_benchmark_topic_id(team_count, member_count)
+            course_teams = self.populate_course_teams(
+                self.course.id, topic_id, team_count=team_count, member_count=member_count
+            )
+
+            kwargs = {"course_id": self.course.id, "topic_id": topic_id}
+            context = dict(self.context, topic_id=topic_id)
+            names.append(self._record_view(
+                f"list_teams/{team_count}x{member_count}",
+                reverse("plugin_api:plugin_api.list_teams", kwargs=kwargs),
+                context,
+            ))
+
+            if member_count not in detail_member_counts:
+                detail_member_counts.add(member_count)
+                kwargs = dict(kwargs, team_id=course_teams[0].team_id)
+                names.append(self._record_view(
+                    f"get_team_details/{member_count}",
+                    reverse("plugin_api:plugin_api.get_team_details", kwargs=kwargs),
+                    context,
+                ))
+
+            joined_teams.append(course_teams[-1])
+
+        # one team per teamset, as CourseTeam.add_user allows
+        for course_team in joined_teams[1:]:
+            CourseTeamMembershipFactory.create(team=course_team, user=self.user)
+
+        names.append(self._record_view(
+            f"list_teams_user_joined/{len(joined_teams)}",
+            reverse(
+                "plugin_api:plugin_api.list_teams_user_joined",
+                kwargs={"course_id": self.course.id},
+            ),
+            dict(self.context, expand=["team"]),
+        ))
+
+        self._assert_no_regressions(names)
+
+
+class TestTeamDiscussionFileUploadBenchmark(BenchmarkTestCase):
+    team_id = "benchmark-team-1"
+
+    def tearDown(self):
+        if os.path.exists(settings.MEDIA_ROOT + self.team_id):
+            shutil.rmtree(settings.MEDIA_ROOT + self.team_id)
+
+    def _benchmark_upload(self, name, upload_type, filename):
+        with open(os.path.join(DIR_PATH, "data", filename), "rb") as upload_file:
+            content = upload_file.read()
+
+        def call():
+            upload_file = SimpleUploadedFile(
+                filename, content, content_type="multipart/form-data"
+            )
+            self.context["request"].FILES["upload_file"] = upload_file
+            serializer = TeamDiscussionFileUploadSerializer(
+                data={
+                    "team_id": self.team_id,
+                    "upload_type": upload_type,
+                    "upload_file": upload_file,
+                },
+                context=self.context,
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+        self._assert_no_regressions([self._record(name, call)])
+
+    def test_upload_image(self):
+        self._benchmark_upload("upload_image", "image", "unnamed.jpeg")
+
+    def test_upload_attachment(self):
+        self._benchmark_upload("upload_attachment", "attachment", "testfile.txt")
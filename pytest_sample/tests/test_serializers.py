@@ -2,14 +2,16 @@ import pytest
 import os
 import shutil
 
-from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile, UploadedFile
 from django.core.files import File
 from django.conf import settings
+from django.test.client import RequestFactory
 
 from rest_framework import exceptions
 
 from lms.djangoapps.teams.models import CourseTeam, CourseTeamMembership
 from plugin_api.teams.serializers import (
+    CourseTeamExtensionSerializer,
     ExtendedCourseTeamSerializer,
     ExtendedMembershipSerializer,
     TeamCreatorSerializer,
@@ -18,6 +20,7 @@ from plugin_api.teams.serializers import (
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from .conftest import (
     CourseTeamMembershipFactory,
+    UserFactory,
     _expected_team_serializer_fields,
     _expected_membership_serializer_fields,
     _expected_membership_in_team_serializer_fields,
@@ -29,6 +32,9 @@ from unittest import mock
 
 DIR_PATH = os.path.dirname(os.path.realpath(__file__))
 TEST_MAX_UPLOAD_FILE_SIZE = 1024
+# limit falls between the first and second upload chunk
+TEST_CHUNKED_MAX_UPLOAD_FILE_SIZE = UploadedFile.DEFAULT_CHUNK_SIZE + 1024
+TEST_CHUNKED_UPLOAD_FILE_SIZE = UploadedFile.DEFAULT_CHUNK_SIZE * 3
 
 
 class SerializerTestCase(SharedModuleStoreTestCase):
@@ -73,6 +79,58 @@ class TestCourseTeamSerializer(SerializerTestCase):
         )
 
 
+class TestCourseTeamSerializerPerUserFields(SerializerTestCase):
+    _per_user_fields = ["is_new", "unread_post_count", "members", "creator"]
+    _per_user_member_fields = ["is_current_user"]
+
+    def _shared_user(self, user_data):
+        return {
+            field: value for field, value in user_data.items()
+            if field not in self._per_user_member_fields
+        }
+
+    @pytest.mark.django_db
+    def test_shared_fields_are_same_for_every_viewer(self):
+        # make the requesting user the team creator
+        context = {
+            "request": self._context["request"],
+            "team_id": self._course_team.team_id,
+            "save_creator": True,
+        }
+        team_extension_serializer = CourseTeamExtensionSerializer(
+            data={"image": None}, context=context
+        )
+        team_extension_serializer.is_valid(raise_exception=True)
+        team_extension_serializer.save()
+        self._course_team.refresh_from_db()
+
+        other_request = RequestFactory().request()
+        other_request.user = UserFactory.create()
+        other_context = dict(self._context, request=other_request)
+
+        data = ExtendedCourseTeamSerializer(
+            self._course_team, context=self._context
+        ).data
+        other_data = ExtendedCourseTeamSerializer(
+            self._course_team, context=other_context
+        ).data
+
+        shared_fields = set(data.keys()) - set(self._per_user_fields)
+        assert {field: data[field] for field in shared_fields} == {
+            field: other_data[field] for field in shared_fields
+        }
+        assert [self._shared_user(member) for member in data["members"]] == [
+            self._shared_user(member) for member in other_data["members"]
+        ]
+        assert data["creator"]["username"] == self._user.username
+        assert self._shared_user(data["creator"]) == self._shared_user(other_data["creator"])
+
+        assert data["members"][0]["is_current_user"] == True
+        assert other_data["members"][0]["is_current_user"] == False
+        assert data["creator"]["is_current_user"] == True
+        assert other_data["creator"]["is_current_user"] == False
+
+
 class TestMembershipSerializer(SerializerTestCase):
     @pytest.mark.django_db
     def test_contains_expected_fields(self):
@@ -125,6 +183,12 @@ class TeamDiscussionFileTestCase(SharedModuleStoreTestCase):
             "unnamed.jp", invalid_file.read(), content_type="multipart/form-data"
         )
 
+        # text content disguised with an image extension
+        disguised_file = File(open(DIR_PATH + "/data/testfile.txt", "rb"))
+        self.disguised_image_upload_file = SimpleUploadedFile(
+            "testfile.jpeg", disguised_file.read(), content_type="multipart/form-data"
+        )
+
         self._context = {
             "request": request_fx,
             "admin_token": "dummy_token",
@@ -292,6 +356,69 @@ class TestTeamDiscussionFileUploadSerializer(TeamDiscussionFileTestCase):
             f"Maximum upload file size is {TEST_MAX_UPLOAD_FILE_SIZE} bytes."
         )
 
+    @pytest.mark.xfail(
+        strict=True, reason="magic bytes check not implemented in plugin_api yet"
+    )
+    def test_invalid_image_content(self, mock):
+        # Arrange
+        self._context["request"].FILES["upload_file"] = self.disguised_image_upload_file
+        data = {
+            "team_id": self.team_id,
+            "upload_type": "image",
+            "upload_file": self.disguised_image_upload_file,
+        }
+
+        # Act
+        serializer = TeamDiscussionFileUploadSerializer(
+            data=data, context=self._context
+        )
+
+        # Assert
+        with pytest.raises(exceptions.PermissionDenied) as e_info:
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+        assert e_info.match("The file content does not match its extension.")
+        assert not os.path.exists(settings.MEDIA_ROOT + self.expected_image_filename)
+
+    @mock.patch(
+        "plugin_api.settings.MAX_UPLOAD_FILE_SIZE", TEST_CHUNKED_MAX_UPLOAD_FILE_SIZE
+    )
+    def test_invalid_size_should_not_keep_partial_file(self, mock):
+        # Arrange
+        # a valid image padded to span several upload chunks
+        large_image_upload_file = TemporaryUploadedFile(
+            "unnamed.jpeg", "multipart/form-data", TEST_CHUNKED_UPLOAD_FILE_SIZE, None
+        )
+        self.addCleanup(large_image_upload_file.close)
+        with open(DIR_PATH + "/data/unnamed.jpeg", "rb") as image_file:
+            large_image_upload_file.write(
+                image_file.read().ljust(TEST_CHUNKED_UPLOAD_FILE_SIZE, b"\0")
+            )
+        large_image_upload_file.seek(0)
+
+        self._context["request"].FILES["upload_file"] = large_image_upload_file
+        data = {
+            "team_id": self.team_id,
+            "upload_type": "image",
+            "upload_file": large_image_upload_file,
+        }
+
+        # Act
+        serializer = TeamDiscussionFileUploadSerializer(
+            data=data, context=self._context
+        )
+
+        # Assert
+        with pytest.raises(exceptions.PermissionDenied) as e_info:
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+        assert e_info.match(
+            f"Maximum upload file size is {TEST_CHUNKED_MAX_UPLOAD_FILE_SIZE} bytes."
+        )
+        assert not os.path.exists(settings.MEDIA_ROOT + self.expected_image_filename)
+
     def test_invalid_upload_type(self, mock):
         # Arrange
         self._context["request"].FILES["upload_file"] = self.image_upload_file
@@ -1,15 +1,22 @@
+import json
 import pytest
+import requests
 from datetime import timedelta
 
+from django.conf import settings as django_settings
+from django.db import connection
 from django.utils import timezone
 from django.urls import reverse
 from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
 
 from unittest import mock
 from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 
 from .conftest import (
     CourseTeamFactory,
+    CourseTeamMembershipFactory,
+    UserFactory,
     _expected_team_detail_response_fields,
     _expected_team_list_response_fields,
     _expected_membership_list_response_fields,
@@ -19,6 +26,7 @@ from .conftest import (
 
 from common.djangoapps.util.testing import patch_sessions, patch_testcase
 
+from openedx.core.lib.teams_config import TeamsConfig
 from plugin_api import settings
 from plugin_api.teams.models import CourseTeamExtension
 from plugin_api.teams.serializers import CourseTeamExtensionSerializer
@@ -74,6 +82,80 @@ class TestTeamsDetailView(TeamTestCase):
             assert response.status_code == 200
 
 
+@pytest.mark.xfail(
+    strict=True,
+    raises=KeyError,
+    reason="ETag / conditional GET not implemented in plugin_api yet",
+)
+class TestTeamsDetailConditionalGet(TeamTestCase):
+    def _get_course_teams_url(self):
+        kwargs = {
+            "course_id": self.course.id,
+            "topic_id": self.topic_id,
+            "team_id": self.course_team.team_id,
+        }
+        return reverse("plugin_api:plugin_api.get_team_details", kwargs=kwargs)
+
+    @pytest.mark.django_db
+    def test_teams_detail_not_modified(self):
+        course_teams_url = self._get_course_teams_url()
+        with mock.patch(AUTH_KEYCLOAK, return_value=(self.user, None)), mock.patch(
+            TEAM_MIXIN, return_value=self.context
+        ):
+            response = self.client.get(course_teams_url)
+            assert response.status_code == 200
+            etag = response["ETag"]
+
+            response = self.client.get(course_teams_url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 304
+            assert response["ETag"] == etag
+
+    @pytest.mark.django_db
+    def test_teams_detail_etag_changes_with_membership(self):
+        course_teams_url = self._get_course_teams_url()
+        with mock.patch(AUTH_KEYCLOAK, return_value=(self.user, None)), mock.patch(
+            TEAM_MIXIN, return_value=self.context
+        ):
+            response = self.client.get(course_teams_url)
+            etag = response["ETag"]
+
+            CourseTeamMembershipFactory.create(
+                team=self.course_team, user=UserFactory.create()
+            )
+
+            response = self.client.get(course_teams_url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200
+            assert response["ETag"] != etag
+            assert len(response.json()["data"]["members"]) == 2
+
+    @pytest.mark.django_db
+    def test_teams_detail_etag_changes_with_update(self):
+        course_teams_url = self._get_course_teams_url()
+        with mock.patch(AUTH_KEYCLOAK, return_value=(self.user, None)), mock.patch(
+            TEAM_MIXIN, return_value=self.context
+        ):
+            response = self.client.get(course_teams_url)
+            etag = response["ETag"]
+
+            response = self.client.patch(
+                course_teams_url,
+                {
+                    "name": "Course one team renamed",
+                    "topic_id": self.topic_id,
+                    "description": "New Team Description",
+                    "country": "US",
+                    "language": "en",
+                },
+                content_type="application/json",
+            )
+            assert response.status_code == 200
+
+            response = self.client.get(course_teams_url, HTTP_IF_NONE_MATCH=etag)
+            assert response.status_code == 200
+            assert response["ETag"] != etag
+            assert response.json()["data"]["name"] == "Course one team renamed"
+
+
 class TestTeamsIsNewView(TeamTestCase):
     @pytest.mark.django_db
     def test_teams_list_by_topic_id(self):
@@ -107,6 +189,97 @@ class TestTeamsIsNewView(TeamTestCase):
                 assert data[1]["is_new"] == True
 
 
+class TestTeamsListMemberCount(TeamTestCase):
+    @pytest.mark.django_db
+    def test_member_count_follows_membership_changes(self):
+        kwargs = {"course_id": self.course.id, "topic_id": self.topic_id}
+        course_teams_url = reverse(
+            "plugin_api:plugin_api.list_teams", kwargs=kwargs
+        )
+        with mock.patch(AUTH_KEYCLOAK, return_value=(self.user, None)), mock.patch(
+            TEAM_MIXIN, return_value=self.context
+        ):
+            response = self.client.get(course_teams_url)
+            assert response.json()["data"]["results"][0]["member_count"] == 1
+
+            membership = CourseTeamMembershipFactory.create(
+                team=self.course_team, user=UserFactory.create()
+            )
+            response = self.client.get(course_teams_url)
+            assert response.json()["data"]["results"][0]["member_count"] == 2
+
+            membership.delete()
+            response = self.client.get(course_teams_url)
+            assert response.json()["data"]["results"][0]["member_count"] == 1
+
+
+class TeamForumCallTestCase(SharedModuleStoreTestCase):
+    @pytest.fixture(autouse=True)
+    def _conftest(self, team_api_test_data, populate_course_teams):
+        team_api_test_data(self)
+        self.populate_course_teams = populate_course_teams
+
+    @staticmethod
+    def _forum_response(session, request, **kwargs):
+        # canned comments service reply, no request leaves the test run
+        response = requests.Response()
+        response.status_code = 200
+        response.url = request.url
+        response.request = request
+        response.headers["Content-Type"] = "application/json"
+        response._content = json.dumps(
+            {"unread_comments_count": 0, "collection": [], "page": 1, "num_pages": 1}
+        ).encode()
+        return response
+
+    def _get_forum_call_count(self, url):
+        with mock.patch.object(
+            requests.Session, "send", autospec=True, side_effect=self._forum_response
+        ) as session_send:
+            response = self.client.get(url)
+            assert response.status_code == 200
+
+        forum_calls = [
+            call for call in session_send.call_args_list
+            if call.args[1].url.startswith(django_settings.COMMENTS_SERVICE_URL)
+        ]
+        return response, len(forum_calls)
+
+    def _get_course_teams_url(self):
+        kwargs = {"course_id": self.course.id, "topic_id": self.topic_id}
+        return reverse("plugin_api:plugin_api.list_teams", kwargs=kwargs)
+
+
+class TestTeamsListForumCalls(TeamForumCallTestCase):
+    @pytest.mark.django_db
+    def test_list_teams_should_call_forum(self):
+        with mock.patch(AUTH_KEYCLOAK, return_value=(self.user, None)), mock.patch(
+            TEAM_MIXIN, return_value=self.context
+        ):
+            response, forum_calls = self._get_forum_call_count(self._get_course_teams_url())
+            assert len(response.json()["data"]["results"]) == 1
+            assert forum_calls > 0
+
+    @pytest.mark.xfail(
+        strict=True, reason="bulk unread_post_count resolver not implemented in plugin_api yet"
+    )
+    @pytest.mark.django_db
+    def test_forum_calls_should_not_grow_with_page_size(self):
+        course_teams_url = self._get_course_teams_url()
+        with mock.patch(AUTH_KEYCLOAK, return_value=(self.user, None)), mock.patch(
+            TEAM_MIXIN, return_value=self.context
+        ):
+            _, single_team_calls = self._get_forum_call_count(course_teams_url)
+
+            self.populate_course_teams(
+                self.course.id, self.topic_id, team_count=5, member_count=1
+            )
+
+            response, forum_calls = self._get_forum_call_count(course_teams_url)
+            assert len(response.json()["data"]["results"]) == 6
+            assert forum_calls == single_team_calls
+
+
 class TeamEmojiTestCase(SharedModuleStoreTestCase):
     @pytest.fixture(autouse=True)
     def _conftest(self, team_emoji_api_test_data):
@@ -220,6 +393,125 @@ class TestMembershipListView(MembershipTestCase):
             )
 
 
+# Query Count Test Cases
+class TeamQueryCountTestCase(SharedModuleStoreTestCase):
+    extra_topic_ids = [f"the-teamset-{index}" for index in range(2, 7)]
+
+    @pytest.fixture
+    def teams_config_fx(self, topic_id_fx) -> TeamsConfig:
+        # extra teamsets let the user join one team in each, as CourseTeam.add_user allows
+        return TeamsConfig(
+            {
+                "topics": [
+                    {
+                        "name": topic_id,
+                        "description": f"Description for {topic_id}",
+                        "id": topic_id,
+                        "max_team_size": 30,
+                    }
+                    for topic_id in [topic_id_fx] + self.extra_topic_ids
+                ]
+            }
+        )
+
+    @pytest.fixture(autouse=True)
+    def _conftest(self, team_api_test_data, populate_course_teams):
+        team_api_test_data(self)
+        self.populate_course_teams = populate_course_teams
+
+    def _get_query_count(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        assert response.status_code == 200
+        return response, len(queries)
+
+
+class TestTeamsListQueryCount(TeamQueryCountTestCase):
+    @pytest.mark.xfail(
+        strict=True, reason="prefetching team queryset not implemented in plugin_api yet"
+    )
+    @pytest.mark.django_db
+    def test_query_count_should_not_grow_with_page_size(self):
+        kwargs = {"course_id": self.course.id, "topic_id": self.topic_id}
+        course_teams_url = reverse(
+            "plugin_api:plugin_api.list_teams", kwargs=kwargs
+        )
+        with mock.patch(AUTH_KEYCLOAK, return_value=(self.user, None)), mock.patch(
+            TEAM_MIXIN, return_value=self.context
+        ):
+            # call first time to record last_visited_teams_at
+            self.client.get(course_teams_url)
+            _, expected_queries = self._get_query_count(course_teams_url)
+
+            self.populate_course_teams(
+                self.course.id, self.topic_id, team_count=5, member_count=3
+            )
+
+            response, queries = self._get_query_count(course_teams_url)
+            assert queries == expected_queries
+            assert len(response.json()["data"]["results"]) == 6
+
+
+class TestTeamsDetailQueryCount(TeamQueryCountTestCase):
+    @pytest.mark.xfail(
+        strict=True, reason="prefetching team queryset not implemented in plugin_api yet"
+    )
+    @pytest.mark.django_db
+    def test_query_count_should_not_grow_with_member_count(self):
+        kwargs = {
+            "course_id": self.course.id,
+            "topic_id": self.topic_id,
+            "team_id": self.course_team.team_id,
+        }
+        course_teams_url = reverse(
+            "plugin_api:plugin_api.get_team_details", kwargs=kwargs
+        )
+        with mock.patch(AUTH_KEYCLOAK, return_value=(self.user, None)), mock.patch(
+            TEAM_MIXIN, return_value=self.context
+        ):
+            self.client.get(course_teams_url)
+            _, expected_queries = self._get_query_count(course_teams_url)
+
+            for _ in range(5):
+                CourseTeamMembershipFactory.create(
+                    team=self.course_team, user=UserFactory.create()
+                )
+
+            response, queries = self._get_query_count(course_teams_url)
+            assert queries == expected_queries
+            assert len(response.json()["data"]["members"]) == 6
+
+
+class TestMembershipListQueryCount(TeamQueryCountTestCase):
+    @pytest.mark.xfail(
+        strict=True, reason="prefetching team queryset not implemented in plugin_api yet"
+    )
+    @pytest.mark.django_db
+    def test_query_count_should_not_grow_with_joined_teams(self):
+        kwargs = {"course_id": self.course.id}
+        membership_url = reverse(
+            "plugin_api:plugin_api.list_teams_user_joined",
+            kwargs=kwargs,
+        )
+        context = dict(self.context, expand=["team"])
+        with mock.patch(AUTH_KEYCLOAK, return_value=(self.user, None)), mock.patch(
+            TEAM_MIXIN, return_value=context
+        ):
+            self.client.get(membership_url)
+            _, expected_queries = self._get_query_count(membership_url)
+
+            # one team per teamset, as CourseTeam.add_user allows
+            for extra_topic_id in self.extra_topic_ids:
+                course_team, = self.populate_course_teams(
+                    self.course.id, extra_topic_id, team_count=1, member_count=3
+                )
+                CourseTeamMembershipFactory.create(team=course_team, user=self.user)
+
+            response, queries = self._get_query_count(membership_url)
+            assert queries == expected_queries
+            assert len(response.json()["data"]["results"]) == 6
+
+
 # Team Image Test Cases
 class TeamImageTestCase(SharedModuleStoreTestCase):
     @pytest.fixture(autouse=True)